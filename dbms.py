@@ -5,10 +5,17 @@ Sports Club Management System
 
 import tkinter as tk
 from tkinter import messagebox
+import json
+import os
+import threading
+import time
+import zlib
 import ttkbootstrap as ttk
 from ttkbootstrap.constants import *
 import mysql.connector
 
+from schedule import ScheduleIndex
+
 # ---------------------------------------
 # DB CONFIG
 # ---------------------------------------
@@ -19,6 +26,10 @@ DB_CONFIG = {
     "database": "sportsclubdb"
 }
 
+# Last-loaded grid contents, shown at startup until the DB answers
+SNAPSHOT_DIR = os.path.join(os.path.expanduser("~"), ".sportsclub_snapshots")
+SNAPSHOT_MAX_AGE = 24 * 3600  # seconds; older snapshots are ignored
+
 # ---------------------------------------
 # DB UTILS
 # ---------------------------------------
@@ -88,6 +99,170 @@ def validate_entries(entry_dict):
     return True
 
 
+# ---------------------------------------
+# GRID SNAPSHOTS
+# ---------------------------------------
+# Each grid is stored column-wise as zlib-compressed JSON. Dates and amounts
+# are written as strings, which is how the grid displays them anyway.
+# The files hold member contact and payment data, so they are private to the
+# user (0700 dir, 0600 files), and JSON can't run code when read back.
+def snapshot_path(key):
+    return os.path.join(SNAPSHOT_DIR, key + ".snap")
+
+def save_snapshot(key, rows):
+    os.makedirs(SNAPSHOT_DIR, mode=0o700, exist_ok=True)
+    os.chmod(SNAPSHOT_DIR, 0o700)
+    data = {"saved": time.time(), "cols": list(zip(*rows))}
+    blob = zlib.compress(json.dumps(data, default=str).encode("utf-8"))
+    tmp = snapshot_path(key) + ".tmp"
+    fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, "wb") as f:
+        f.write(blob)
+    os.replace(tmp, snapshot_path(key))
+
+def load_snapshot(key, max_age=SNAPSHOT_MAX_AGE):
+    """Return (rows, stats) or None when missing, unreadable or too old."""
+    path = snapshot_path(key)
+    t0 = time.perf_counter()
+    try:
+        with open(path, "rb") as f:
+            blob = f.read()
+        data = json.loads(zlib.decompress(blob).decode("utf-8"))
+        age = time.time() - data["saved"]
+        rows = [tuple(r) for r in zip(*data["cols"])]
+    except Exception:
+        return None
+    if age > max_age:
+        return None
+    stats = {"size": len(blob), "load_ms": (time.perf_counter() - t0) * 1000, "age": age}
+    return rows, stats
+
+def fmt_snapshot(stats):
+    return f"{stats['size'] / 1024:.1f} KB, loaded in {stats['load_ms']:.1f} ms, {stats['age'] / 60:.0f} min old"
+
+def show_rows(tree, rows, tags=()):
+    tree.delete(*tree.get_children())
+    for r in rows:
+        tree.insert("", tk.END, values=r, tags=tags)
+
+def load_tree(tree, key, query):
+    """Fill a grid from the DB, or from its snapshot on the first load.
+
+    The first call per grid renders the snapshot (if recent enough) marked
+    stale and revalidates in a background thread; later calls (Refresh,
+    after edits) query the DB directly.
+    """
+    status = getattr(tree.winfo_toplevel(), "set_status", lambda k, m: None)
+    # Bumped on every load so a slow background reload can't overwrite newer rows
+    tree.load_gen = gen = getattr(tree, "load_gen", 0) + 1
+
+    def show_live(rows):
+        show_rows(tree, rows)
+        try:
+            save_snapshot(key, rows)
+            status(key, "live")
+        except OSError as e:
+            status(key, f"live (snapshot not saved: {e})")
+
+    snap = None if getattr(tree, "loaded", False) else load_snapshot(key)
+    tree.loaded = True
+    if snap is None:
+        show_live(run_select(query))
+        return
+
+    rows, stats = snap
+    tree.tag_configure("stale", foreground="gray")
+    show_rows(tree, rows, ("stale",))
+    status(key, "stale (" + fmt_snapshot(stats) + "), refreshing")
+
+    result = {}
+    def work():
+        try:
+            result["rows"] = run_select(query)
+        except Exception as e:
+            result["err"] = str(e)
+    th = threading.Thread(target=work, daemon=True)
+    th.start()
+
+    # Tk widgets may only be touched from the main thread, so poll for the result
+    def poll():
+        if th.is_alive():
+            tree.after(100, poll)
+        elif tree.load_gen != gen:
+            return
+        elif "rows" in result:
+            show_live(result["rows"])
+        else:
+            status(key, "stale (" + fmt_snapshot(stats) + "), refresh failed: " + result["err"])
+    tree.after(100, poll)
+
+
+# ---------------------------------------
+# SCHEDULE CONFLICTS
+# ---------------------------------------
+SCHEDULE_SQL = """
+    SELECT e.EventID, e.EventName, e.Date, e.Location, a.CoachID
+    FROM Event e LEFT JOIN Activity a ON e.ActivityID = a.ActivityID
+"""
+
+def load_schedule():
+    return ScheduleIndex(run_select(SCHEDULE_SQL))
+
+# One index shared by the Events and Reports tabs; rebuilt lazily after reset
+_schedule = None
+
+def get_schedule():
+    global _schedule
+    if _schedule is None: _schedule = load_schedule()
+    return _schedule
+
+def reset_schedule():
+    global _schedule
+    _schedule = None
+
+def activity_coach(activity_id):
+    return call_func("SELECT CoachID FROM Activity WHERE ActivityID=%s", (activity_id,))
+
+def activity_conflicts(activity_id, coach_id):
+    """Coach clashes caused by moving an activity's events to coach_id."""
+    old = activity_coach(activity_id)
+    if old is not None and str(old) == str(coach_id):
+        return []
+    sched = get_schedule()
+    msgs = []
+    for eid, d in run_select("SELECT EventID, Date FROM Event WHERE ActivityID=%s AND Date IS NOT NULL", (activity_id,)):
+        msgs.extend(sched.check(eid, d, None, coach_id))
+    return msgs
+
+def member_conflicts(member_id, event_id=None, skip_pid=None):
+    """Events on the same date that a member participates in.
+
+    With event_id given, only clashes with that event's date are returned,
+    ignoring the participation row skip_pid (the one being edited).
+    """
+    rows = run_select("""
+        SELECT p.ParticipationID, e.EventID, e.EventName, e.Date
+        FROM Participation p JOIN Event e ON p.EventID = e.EventID
+        WHERE p.MemberID=%s AND e.Date IS NOT NULL
+    """, (member_id,))
+    by_date = {}
+    for pid, eid, name, d in rows:
+        if skip_pid is not None and str(pid) == str(skip_pid): continue
+        by_date.setdefault(d, []).append((str(eid), name))
+    if event_id is not None:
+        d = call_func("SELECT Date FROM Event WHERE EventID=%s", (event_id,))
+        return [(d, eid, name) for eid, name in by_date.get(d, []) if eid != str(event_id)]
+    out = []
+    for d in sorted(by_date):
+        if len(by_date[d]) > 1:
+            out.extend((d, eid, name) for eid, name in by_date[d])
+    return out
+
+def confirm_conflicts(msgs):
+    if not msgs: return True
+    return messagebox.askyesno("Schedule Conflict", "\n".join(msgs) + "\n\nSave anyway?")
+
+
 
 # =============================================================================
 # MAIN WINDOW (YOUR GUI — UNCHANGED)
@@ -98,6 +273,10 @@ class App(ttk.Window):
         self.title("Sports Club Management System")
         self.geometry("1400x850")
 
+        self.snap_status = {}
+        self.status = ttk.Label(self, anchor="w", bootstyle=SECONDARY)
+        self.status.pack(side=BOTTOM, fill=X, padx=10)
+
         tabs = ttk.Notebook(self, bootstyle="info")
         tabs.pack(fill="both", expand=True, padx=10, pady=10)
 
@@ -107,6 +286,10 @@ class App(ttk.Window):
         tabs.add(EventParticipationTab(tabs), text="Events / Participation")
         tabs.add(ReportsTab(tabs), text="Procedures / Functions")
 
+    def set_status(self, key, msg):
+        self.snap_status[key] = msg
+        self.status.config(text="   |   ".join(f"{k}: {v}" for k, v in self.snap_status.items()))
+
 
 # =============================================================================
 # MEMBER TAB
@@ -157,9 +340,7 @@ class MemberTab(ttk.Frame):
             if i < len(data): self.entries[key].insert(0, data[i])
 
     def load(self):
-        self.tree.delete(*self.tree.get_children())
-        for r in run_select("SELECT MemberID,Name,Age,Gender,ContactNo,Email,MembershipType,JoinDate FROM Member"):
-            self.tree.insert("", tk.END, values=r)
+        load_tree(self.tree, "member", "SELECT MemberID,Name,Age,Gender,ContactNo,Email,MembershipType,JoinDate FROM Member")
 
     def add(self):
         if not validate_entries(self.entries): return
@@ -244,9 +425,7 @@ class PaymentTab(ttk.Frame):
             if i < len(vals): self.entries[k].insert(0, vals[i])
 
     def load(self):
-        self.tree.delete(*self.tree.get_children())
-        for r in run_select("SELECT PaymentID,MemberID,Amount,PaymentDate,PaymentMode FROM Payment"):
-            self.tree.insert("", tk.END, values=r)
+        load_tree(self.tree, "payment", "SELECT PaymentID,MemberID,Amount,PaymentDate,PaymentMode FROM Payment")
 
     def add(self):
         if not validate_entries(self.entries): return
@@ -334,9 +513,7 @@ class CoachActivityTab(ttk.Frame):
 
     # COACH
     def load_c(self):
-        self.tree.delete(*self.tree.get_children())
-        for r in run_select("SELECT CoachID,Name,Specialization,ContactNo,Email FROM Coach"):
-            self.tree.insert("", tk.END, values=r)
+        load_tree(self.tree, "coach", "SELECT CoachID,Name,Specialization,ContactNo,Email FROM Coach")
 
     def fill_c(self, _):
         sel = self.tree.focus()
@@ -371,9 +548,7 @@ class CoachActivityTab(ttk.Frame):
 
     # ACTIVITY
     def load_a(self):
-        self.tree2.delete(*self.tree2.get_children())
-        for r in run_select("SELECT ActivityID,ActivityName,Description,CoachID FROM Activity"):
-            self.tree2.insert("", tk.END, values=r)
+        load_tree(self.tree2, "activity", "SELECT ActivityID,ActivityName,Description,CoachID FROM Activity")
 
     def fill_a(self, _):
         sel = self.tree2.focus()
@@ -386,22 +561,27 @@ class CoachActivityTab(ttk.Frame):
     def add_a(self):
         if not validate_entries(self.a): return
         vals = tuple(self.a[k].get() for k in self.a)
+        if not confirm_conflicts(activity_conflicts(vals[0], vals[3])): return
         ok, err = run_dml("INSERT INTO Activity VALUES (%s,%s,%s,%s)", vals)
+        if ok: reset_schedule()
         messagebox.showinfo("Added","Activity Added") if ok else messagebox.showerror("Error", err)
         self.load_a()
 
     def up_a(self):
         if not validate_entries(self.a): return
         v = tuple(self.a[k].get() for k in self.a)
+        if not confirm_conflicts(activity_conflicts(v[0], v[3])): return
         ok, err = run_dml("""
             UPDATE Activity SET ActivityName=%s,Description=%s,CoachID=%s WHERE ActivityID=%s
         """, v[1:] + (v[0],))
+        if ok: reset_schedule()
         messagebox.showinfo("Updated","Activity Updated") if ok else messagebox.showerror("Error", err)
         self.load_a()
 
     def del_a(self):
         aid = self.a["ActivityID"].get()
         ok, err = run_dml("DELETE FROM Activity WHERE ActivityID=%s", (aid,))
+        if ok: reset_schedule()
         messagebox.showinfo("Deleted","Activity Deleted") if ok else messagebox.showerror("Error", err)
         self.load_a()
 
@@ -432,7 +612,7 @@ class EventParticipationTab(ttk.Frame):
         ttk.Button(box, text="Add", command=self.add_e, bootstyle=SUCCESS).grid(row=1, column=0)
         ttk.Button(box, text="Update", command=self.up_e, bootstyle=WARNING).grid(row=1, column=1)
         ttk.Button(box, text="Delete", command=self.del_e, bootstyle=DANGER).grid(row=1, column=2)
-        ttk.Button(box, text="Refresh", command=self.load_e, bootstyle=INFO).grid(row=1, column=3)
+        ttk.Button(box, text="Refresh", command=self.refresh_e, bootstyle=INFO).grid(row=1, column=3)
 
         self.tree = ttk.Treeview(self, columns=fields, show="headings")
         for c in fields:
@@ -468,9 +648,24 @@ class EventParticipationTab(ttk.Frame):
 
     # EVENT CRUD
     def load_e(self):
-        self.tree.delete(*self.tree.get_children())
-        for r in run_select("SELECT EventID,EventName,Date,Location,ActivityID FROM Event"):
-            self.tree.insert("", tk.END, values=r)
+        load_tree(self.tree, "event", "SELECT EventID,EventName,Date,Location,ActivityID FROM Event")
+
+    def refresh_e(self):
+        reset_schedule()
+        self.load_e()
+
+    def event_conflicts(self, v, coach):
+        # Index is built on first use so startup doesn't wait on the schedule query
+        try:
+            return get_schedule().check(v[0], v[2], v[3], coach)
+        except ValueError:
+            return []
+
+    def index_event(self, v, coach):
+        try:
+            get_schedule().add(v[0], v[1], v[2], v[3], coach)
+        except ValueError:
+            reset_schedule()
 
     def fill_e(self, _):
         sel = self.tree.focus()
@@ -483,30 +678,35 @@ class EventParticipationTab(ttk.Frame):
     def add_e(self):
         if not validate_entries(self.e): return
         v = tuple(self.e[k].get() for k in self.e)
+        coach = activity_coach(v[4])
+        if not confirm_conflicts(self.event_conflicts(v, coach)): return
         ok, err = run_dml("INSERT INTO Event VALUES (%s,%s,%s,%s,%s)", v)
+        if ok: self.index_event(v, coach)
         messagebox.showinfo("Added","Event Added") if ok else messagebox.showerror("Error", err)
         self.load_e()
 
     def up_e(self):
         if not validate_entries(self.e): return
         v = tuple(self.e[k].get() for k in self.e)
+        coach = activity_coach(v[4])
+        if not confirm_conflicts(self.event_conflicts(v, coach)): return
         ok, err = run_dml("""
             UPDATE Event SET EventName=%s,Date=%s,Location=%s,ActivityID=%s WHERE EventID=%s
         """, v[1:] + (v[0],))
+        if ok: self.index_event(v, coach)
         messagebox.showinfo("Updated","Event Updated") if ok else messagebox.showerror("Error", err)
         self.load_e()
 
     def del_e(self):
         eid = self.e["EventID"].get()
         ok, err = run_dml("DELETE FROM Event WHERE EventID=%s", (eid,))
+        if ok and _schedule is not None: _schedule.remove(eid)
         messagebox.showinfo("Deleted","Event Deleted") if ok else messagebox.showerror("Error", err)
         self.load_e()
 
     # PARTICIPATION CRUD
     def load_p(self):
-        self.tree2.delete(*self.tree2.get_children())
-        for r in run_select("SELECT ParticipationID,MemberID,EventID,Result FROM Participation"):
-            self.tree2.insert("", tk.END, values=r)
+        load_tree(self.tree2, "participation", "SELECT ParticipationID,MemberID,EventID,Result FROM Participation")
 
     def fill_p(self, _):
         sel = self.tree2.focus()
@@ -519,6 +719,7 @@ class EventParticipationTab(ttk.Frame):
     def add_p(self):
         if not validate_entries(self.p): return
         v = tuple(self.p[k].get() for k in self.p)
+        if not self.confirm_member(v): return
         ok, err = run_dml("INSERT INTO Participation VALUES (%s,%s,%s,%s)", v)
         messagebox.showinfo("Added","Participation Added") if ok else messagebox.showerror("Error", err)
         self.load_p()
@@ -526,12 +727,20 @@ class EventParticipationTab(ttk.Frame):
     def up_p(self):
         if not validate_entries(self.p): return
         v = tuple(self.p[k].get() for k in self.p)
+        if not self.confirm_member(v, v[0]): return
         ok, err = run_dml("""
             UPDATE Participation SET MemberID=%s,EventID=%s,Result=%s WHERE ParticipationID=%s
         """, v[1:] + (v[0],))
         messagebox.showinfo("Updated","Participation Updated") if ok else messagebox.showerror("Error", err)
         self.load_p()
 
+    def confirm_member(self, v, skip_pid=None):
+        clashes = member_conflicts(v[1], v[2], skip_pid)
+        return confirm_conflicts([
+            f"Member {v[1]} already takes part in event {eid} ({name}) on {d}"
+            for d, eid, name in clashes
+        ])
+
     def del_p(self):
         pid = self.p["ParticipationID"].get()
         ok, err = run_dml("DELETE FROM Participation WHERE ParticipationID=%s", (pid,))
@@ -575,6 +784,15 @@ class ReportsTab(ttk.Frame):
         ttk.Button(box, text="Total Payment", command=self.tp, bootstyle=SUCCESS).grid(row=2, column=2)
         ttk.Button(box, text="Participation Count", command=self.pc, bootstyle=WARNING).grid(row=2, column=3)
         ttk.Button(box, text="Is Active?", command=self.ac, bootstyle=INFO).grid(row=2, column=4)
+        ttk.Button(box, text="Member Conflicts", command=self.mconf, bootstyle=DANGER).grid(row=2, column=5)
+
+        ttk.Label(box, text="Season From:").grid(row=4, column=0)
+        self.season_from = ttk.Entry(box, width=15)
+        self.season_from.grid(row=4, column=1)
+        ttk.Label(box, text="To:").grid(row=4, column=2)
+        self.season_to = ttk.Entry(box, width=15)
+        self.season_to.grid(row=4, column=3)
+        ttk.Button(box, text="Find Schedule Conflicts", command=self.sconf, bootstyle=DANGER).grid(row=4, column=4)
 
         self.out = ttk.Treeview(self, show="headings")
         self.out.pack(fill=BOTH, expand=True, pady=10)
@@ -616,6 +834,17 @@ class ReportsTab(ttk.Frame):
         r = call_func("SELECT IsMemberActive(%s)", (self.mid.get(),))
         messagebox.showinfo("Active?", "YES" if r else "NO")
 
+    def mconf(self):
+        self.show(member_conflicts(self.mid.get()), ("Date","EventID","EventName"))
+
+    def sconf(self):
+        try:
+            rows = get_schedule().conflicts(self.season_from.get(), self.season_to.get())
+        except ValueError:
+            messagebox.showwarning("Invalid Date", "Season dates must be YYYY-MM-DD")
+            return
+        self.show(rows, ("Kind","Key","Date","EventIDs"))
+
 
 
 # =============================================================================
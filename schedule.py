@@ -0,0 +1,98 @@
+"""
+Schedule conflict index for the Sports Club Management System.
+Kept free of Tk / MySQL imports so it can be tested on its own.
+"""
+
+from bisect import bisect_left, insort
+from datetime import date
+
+
+# Events only carry a Date, so two events overlap when their dates fall
+# in the same [start, end] window (a single day for one event).
+def to_date(v):
+    if isinstance(v, date): return v
+    return date.fromisoformat(str(v).strip())
+
+def loc_key(location):
+    return location.strip().lower()
+
+
+class ScheduleIndex:
+    """Events bucketed by location and by coach, each bucket sorted by date."""
+
+    def __init__(self, rows=()):
+        self.by_loc = {}
+        self.by_coach = {}
+        self.loc_names = {}
+        self.events = {}
+        # Bulk load: append everything, then sort each bucket once
+        for r in rows:
+            self.add(*r, bulk=True)
+        for bucket in list(self.by_loc.values()) + list(self.by_coach.values()):
+            bucket.sort()
+
+    def add(self, eid, name, d, location, coach_id, bulk=False):
+        eid = str(eid)
+        if eid in self.events: self.remove(eid)
+        if d is None: return
+        item = (to_date(d), eid, name)
+        buckets = []
+        if location:
+            key = loc_key(location)
+            self.loc_names.setdefault(key, location.strip())
+            buckets.append(self.by_loc.setdefault(key, []))
+        if coach_id is not None:
+            buckets.append(self.by_coach.setdefault(str(coach_id), []))
+        for bucket in buckets:
+            if bulk: bucket.append(item)
+            else: insort(bucket, item)
+        self.events[eid] = (item, buckets)
+
+    def remove(self, eid):
+        item, buckets = self.events.pop(str(eid), (None, ()))
+        for bucket in buckets:
+            i = bisect_left(bucket, item)
+            if i < len(bucket) and bucket[i] == item:
+                del bucket[i]
+
+    @staticmethod
+    def overlapping(bucket, start, end, skip_id=None):
+        out = []
+        i = bisect_left(bucket, (start,))
+        while i < len(bucket) and bucket[i][0] <= end:
+            if bucket[i][1] != skip_id: out.append(bucket[i])
+            i += 1
+        return out
+
+    def check(self, eid, d, location, coach_id):
+        """Return conflict messages for an event that is about to be saved.
+
+        Pass location=None to check only the coach.
+        """
+        d = to_date(d)
+        eid = str(eid)
+        msgs = []
+        if location:
+            for od, oid, oname in self.overlapping(self.by_loc.get(loc_key(location), []), d, d, eid):
+                msgs.append(f"Location '{location}' already booked on {od} by event {oid} ({oname})")
+        if coach_id is not None:
+            for od, oid, oname in self.overlapping(self.by_coach.get(str(coach_id), []), d, d, eid):
+                msgs.append(f"Coach {coach_id} already assigned on {od} to event {oid} ({oname})")
+        return msgs
+
+    def conflicts(self, start, end):
+        """All same-day clashes in [start, end] as (Kind, Key, Date, EventIDs) rows."""
+        start, end = to_date(start), to_date(end)
+        rows = []
+        for kind, buckets in (("Location", self.by_loc), ("Coach", self.by_coach)):
+            for key, bucket in buckets.items():
+                name = self.loc_names.get(key, key) if kind == "Location" else key
+                hits = self.overlapping(bucket, start, end)
+                i = 0
+                while i < len(hits):
+                    j = i
+                    while j + 1 < len(hits) and hits[j + 1][0] == hits[i][0]: j += 1
+                    if j > i:
+                        rows.append((kind, name, hits[i][0], ", ".join(h[1] for h in hits[i:j + 1])))
+                    i = j + 1
+        return rows
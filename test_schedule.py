@@ -0,0 +1,70 @@
+from datetime import date
+
+from schedule import ScheduleIndex
+
+
+ROWS = [
+    (1, "League A", "2025-06-01", "Main Ground", 1),
+    (2, "League B", "2025-06-01", "  main ground ", 2),
+    (3, "Swim Meet", "2025-06-02", "Pool", 1),
+    (4, "Hall Cup", "2025-06-02", "Hall", 1),
+    (5, "Unscheduled", None, "Main Ground", 1),
+    (6, "Season End", "2025-06-30", "Pool", 3),
+    (7, "Season End 2", "2025-06-30", "Pool", 4),
+]
+
+
+def test_location_clash_ignores_case_and_whitespace():
+    ix = ScheduleIndex(ROWS)
+    msgs = ix.check(9, "2025-06-01", "MAIN GROUND ", None)
+    assert len(msgs) == 2
+    assert all("Location" in m for m in msgs)
+
+
+def test_coach_clash_same_day():
+    ix = ScheduleIndex(ROWS)
+    msgs = ix.check(9, "2025-06-02", "Track", 1)
+    assert msgs == [
+        "Coach 1 already assigned on 2025-06-02 to event 3 (Swim Meet)",
+        "Coach 1 already assigned on 2025-06-02 to event 4 (Hall Cup)",
+    ]
+    assert ix.check(9, "2025-06-03", "Track", 1) == []
+
+
+def test_edited_event_does_not_clash_with_itself():
+    ix = ScheduleIndex(ROWS)
+    assert ix.check(3, "2025-06-02", "Pool", 2) == []
+    assert ix.check("3", date(2025, 6, 2), "Pool", 1) == [
+        "Coach 1 already assigned on 2025-06-02 to event 4 (Hall Cup)",
+    ]
+
+
+def test_events_without_date_are_skipped():
+    ix = ScheduleIndex(ROWS)
+    assert "5" not in ix.events
+    assert all(item[1] != "5" for bucket in ix.by_loc.values() for item in bucket)
+
+
+def test_season_window_boundaries():
+    ix = ScheduleIndex(ROWS)
+    rows = ix.conflicts("2025-06-01", "2025-06-30")
+    assert ("Location", "Main Ground", date(2025, 6, 1), "1, 2") in rows
+    assert ("Coach", "1", date(2025, 6, 2), "3, 4") in rows
+    assert ("Location", "Pool", date(2025, 6, 30), "6, 7") in rows
+    assert len(rows) == 3
+
+    rows = ix.conflicts("2025-06-02", "2025-06-29")
+    assert rows == [("Coach", "1", date(2025, 6, 2), "3, 4")]
+
+
+def test_remove_and_readd_updates_index():
+    ix = ScheduleIndex(ROWS)
+    ix.remove(2)
+    assert ix.check(9, "2025-06-01", "Main Ground", None) == [
+        "Location 'Main Ground' already booked on 2025-06-01 by event 1 (League A)",
+    ]
+    ix.add(4, "Hall Cup", "2025-06-05", "Hall", 1)
+    assert ix.check(9, "2025-06-02", None, 1) == [
+        "Coach 1 already assigned on 2025-06-02 to event 3 (Swim Meet)",
+    ]
+    assert ix.check(9, "2025-06-05", "Hall", None) != []